@@ -0,0 +1,24 @@
+"""
+Shared helpers for the scripts that launch the server as a subprocess.
+"""
+import time
+
+import requests
+
+
+def wait_for_ready(url, timeout=30):
+    """Poll `url` until it answers 200 or `timeout` seconds elapse.
+
+    Returns True as soon as the server responds, so a warm start costs
+    milliseconds instead of a fixed sleep, and a slow cold start still
+    gets the full window instead of flaking with "connection refused".
+    """
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if requests.get(url, timeout=0.5).status_code == 200:
+                return True
+        except requests.RequestException:
+            pass
+        time.sleep(0.1)
+    return False
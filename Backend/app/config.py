@@ -49,6 +49,8 @@ class Settings(BaseSettings):
     CLOUDINARY_CLOUD_NAME: Optional[str] = None
     CLOUDINARY_API_KEY: Optional[str] = None
     CLOUDINARY_API_SECRET: Optional[str] = None
+    # Optional webhook Cloudinary notifies when async eager transforms finish
+    CLOUDINARY_WEBHOOK_URL: Optional[str] = None
 
     # Rate Limiting
     RATE_LIMIT_PAYMENTS: int = 10
@@ -23,6 +23,38 @@ _receiver_df: Optional[pd.DataFrame] = None
 _lock = threading.Lock()
 
 
+def _load_with_parquet_cache(path: str, parse) -> pd.DataFrame:
+    """
+    Parse a CSV via `parse(path)`, keeping a Parquet sidecar next to it.
+
+    The in-memory cache above only helps within one process; the sidecar
+    makes fresh processes (demo scripts, tests) skip the CSV parse and
+    per-column conversions entirely — read_parquet restores the cleaned
+    frame with dtypes intact. The sidecar is rebuilt whenever the CSV is
+    newer; without a parquet engine installed the CSV parse is used as-is.
+    """
+    cache = os.path.splitext(path)[0] + ".parquet"
+    try:
+        if os.path.exists(cache) and os.path.getmtime(cache) >= os.path.getmtime(path):
+            return pd.read_parquet(cache)
+    except Exception as e:
+        logger.warning(f"Ignoring parquet cache {cache}: {e}")
+    df = parse(path)
+    try:
+        df.to_parquet(cache, compression="snappy", index=False)
+    except Exception as e:
+        logger.debug(f"Could not write parquet cache {cache}: {e}")
+    return df
+
+
+def _parse_sender_csv(path: str) -> pd.DataFrame:
+    df = pd.read_csv(path)
+    df['timestamp'] = pd.to_datetime(df['timestamp'])
+    df['amount'] = pd.to_numeric(df['amount'], errors='coerce').fillna(0.0)
+    df['status'] = df['status'].str.upper()
+    return df.sort_values('timestamp').reset_index(drop=True)
+
+
 def load_sender_history() -> pd.DataFrame:
     """Load and cache sender_history.csv as a pandas DataFrame."""
     global _sender_df
@@ -40,11 +72,7 @@ def load_sender_history() -> pd.DataFrame:
             return _sender_df
 
         try:
-            df = pd.read_csv(path)
-            df['timestamp'] = pd.to_datetime(df['timestamp'])
-            df['amount'] = pd.to_numeric(df['amount'], errors='coerce').fillna(0.0)
-            df['status'] = df['status'].str.upper()
-            df = df.sort_values('timestamp').reset_index(drop=True)
+            df = _load_with_parquet_cache(path, _parse_sender_csv)
             _sender_df = df
             logger.info(f"Loaded {len(df)} rows from sender CSV: {path}")
         except Exception as e:
@@ -54,6 +82,18 @@ def load_sender_history() -> pd.DataFrame:
         return _sender_df
 
 
+def _parse_receiver_csv(path: str) -> pd.DataFrame:
+    df = pd.read_csv(path)
+    # Combine date + time if separate columns, else use timestamp
+    if 'date' in df.columns and 'time' in df.columns:
+        df['timestamp'] = pd.to_datetime(df['date'] + ' ' + df['time'])
+    elif 'timestamp' in df.columns:
+        df['timestamp'] = pd.to_datetime(df['timestamp'])
+    df['amount'] = pd.to_numeric(df['amount'], errors='coerce').fillna(0.0)
+    df['status'] = df['status'].str.upper()
+    return df.sort_values('timestamp').reset_index(drop=True)
+
+
 def load_receiver_history() -> pd.DataFrame:
     """Load and cache receiver_history.csv as a pandas DataFrame."""
     global _receiver_df
@@ -71,15 +111,7 @@ def load_receiver_history() -> pd.DataFrame:
             return _receiver_df
 
         try:
-            df = pd.read_csv(path)
-            # Combine date + time if separate columns, else use timestamp
-            if 'date' in df.columns and 'time' in df.columns:
-                df['timestamp'] = pd.to_datetime(df['date'] + ' ' + df['time'])
-            elif 'timestamp' in df.columns:
-                df['timestamp'] = pd.to_datetime(df['timestamp'])
-            df['amount'] = pd.to_numeric(df['amount'], errors='coerce').fillna(0.0)
-            df['status'] = df['status'].str.upper()
-            df = df.sort_values('timestamp').reset_index(drop=True)
+            df = _load_with_parquet_cache(path, _parse_receiver_csv)
             _receiver_df = df
             logger.info(f"Loaded {len(df)} rows from receiver CSV: {path}")
         except Exception as e:
@@ -3,7 +3,7 @@ SQLAlchemy Database Models.
 Defines all database tables for the fraud detection system.
 """
 
-from sqlalchemy import Column, String, Integer, Float, DateTime, ForeignKey, JSON, Text, Numeric, UniqueConstraint, Boolean
+from sqlalchemy import Column, String, Integer, Float, DateTime, ForeignKey, Index, JSON, Text, Numeric, UniqueConstraint, Boolean
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.database.connection import Base
@@ -100,7 +100,13 @@ class Transaction(Base):
     # Relationships
     user = relationship("User", back_populates="transactions")
     risk_events = relationship("RiskEvent", back_populates="transaction")
-    
+
+    __table_args__ = (
+        # "Latest transactions for a user" is the dominant query shape;
+        # this composite index serves it without a separate sort step.
+        Index('ix_transactions_user_created', 'user_id', created_at.desc()),
+    )
+
     def __repr__(self):
         return f"<Transaction {self.transaction_id} - ₹{self.amount}>"
 
@@ -170,16 +170,19 @@ class RedisClient:
     
     def invalidate_user_profile(self, user_id: str) -> bool:
         """
-        Invalidate cached user profile.
-        
+        Invalidate cached user profile and its /profile ETag.
+
         Args:
             user_id: User ID
-        
+
         Returns:
             True if successful
         """
-        key = f"user:{user_id}"
-        return self.delete(key)
+        # The conditional-GET path on /profile keys its ETag separately;
+        # drop it together with the profile so pollers never get a 304
+        # against stale data (e.g. trust_score bumps after payments).
+        ok = self.delete(f"user:{user_id}")
+        return self.delete(f"profile_etag:{user_id}") and ok
     
     def get_receiver_reputation(self, receiver: str) -> Optional[Dict]:
         """
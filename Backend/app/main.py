@@ -79,6 +79,15 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.warning(f"⚠ ML model loading failed: {e}")
         logger.warning("  System will use fallback predictions")
+
+    # Warm the sender-UPI validation cache so no signup pays the CSV parse
+    logger.info("📇 Preloading sender UPI validation set...")
+    try:
+        from app.services.auth_service import _load_valid_sender_upis
+        _load_valid_sender_upis()
+        logger.info("✓ Sender UPI set preloaded")
+    except Exception as e:
+        logger.warning(f"⚠ Sender UPI preload failed: {e}")
     
     logger.info("=" * 60)
     logger.info(f"✓ {settings.APP_NAME} v{settings.APP_VERSION} started")
@@ -8,6 +8,7 @@ from app.services.mock_upi_service import mock_upi_service
 from app.database.connection import get_db
 from app.database.models import ReceiverReputation
 from app.database.redis_client import redis_client
+from app.utils.upi_qr_scanner import invalidate_receiver
 
 router = APIRouter(prefix="/api/receiver", tags=["receiver"])
 
@@ -140,6 +141,7 @@ async def report_receiver(report: ReportRequest, db: Session = Depends(get_db)):
     # Invalidate Cache (Crucial for instant update)
     redis_key = f"receiver_reputation:{report.vpa}"
     redis_client.delete(redis_key)
+    invalidate_receiver(report.vpa)
     
     return {
         "status": "SUCCESS",
@@ -2,24 +2,41 @@
 User endpoints — profile management and UPI ID updates.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, Header, status, UploadFile, File
+from fastapi import APIRouter, Depends, HTTPException, Header, Response, status, UploadFile, File
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
 from typing import Optional
+from operator import attrgetter
+import hashlib
 import logging
+import tempfile
 
+import orjson
+
+from app.config import settings
 from app.database.connection import get_db
 from app.database.models import User
+from app.database.redis_client import redis_client
 from app.services.auth_service import get_current_user
 from app.services.cloudinary_service import upload_avatar
+from app.utils.security import verify_token
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/user", tags=["User"])
 
 
-def _resolve_user(authorization: Optional[str], db: Session) -> User:
-    """Extract the current user from the Authorization header."""
+def get_current_user_dep(
+    authorization: Optional[str] = Header(None),
+    db: Session = Depends(get_db),
+) -> User:
+    """
+    FastAPI dependency resolving the authenticated user once per request.
+
+    Handlers receive the loaded User via `Depends`, so auth costs exactly
+    one query per request regardless of how many places touch the user.
+    """
     if not authorization or not authorization.startswith("Bearer "):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Missing token")
     token = authorization.replace("Bearer ", "")
@@ -28,23 +45,52 @@ def _resolve_user(authorization: Optional[str], db: Session) -> User:
 
 # ── GET /profile ─────────────────────────────────────────────────────────────
 
-@router.get("/profile")
+# Profile payload fields, pulled off the ORM object with one precompiled
+# attrgetter instead of nine attribute lookups in a dict literal.
+_PROFILE_FIELDS = (
+    "user_id", "full_name", "phone", "email",
+    "upi_id", "trust_score", "risk_tier", "avatar_url",
+)
+_profile_getter = attrgetter(*_PROFILE_FIELDS)
+
+_PROFILE_ETAG_KEY = "profile_etag:{}"
+
+
+@router.get("/profile", response_class=ORJSONResponse)
 def get_profile(
     authorization: Optional[str] = Header(None),
-    db: Session = Depends(get_db)
+    if_none_match: Optional[str] = Header(None),
+    db: Session = Depends(get_db),
 ):
-    user = _resolve_user(authorization, db)
-    return {
-        "user_id": user.user_id,
-        "full_name": user.full_name,
-        "phone": user.phone,
-        "email": user.email,
-        "upi_id": user.upi_id,
-        "trust_score": user.trust_score,
-        "risk_tier": user.risk_tier,
-        "avatar_url": user.avatar_url,
-        "created_at": user.created_at.isoformat() if user.created_at else None,
-    }
+    if not authorization or not authorization.startswith("Bearer "):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Missing token")
+    token = authorization.replace("Bearer ", "")
+
+    # Conditional fast path: clients polling /profile send If-None-Match,
+    # and a matching ETag in Redis answers with 304 before any DB query
+    # or serialization happens. The ETag is invalidated on profile writes.
+    if if_none_match:
+        jwt_payload = verify_token(token)
+        user_id = jwt_payload.get("sub") if jwt_payload else None
+        if user_id:
+            cached_etag = redis_client.get(_PROFILE_ETAG_KEY.format(user_id))
+            if cached_etag and cached_etag == if_none_match:
+                return Response(status_code=304, headers={"ETag": cached_etag})
+
+    user = get_current_user(db, token)
+
+    # ORJSONResponse serializes the dict directly in C, skipping the
+    # jsonable_encoder reflection pass of the default JSON path.
+    payload = dict(zip(_PROFILE_FIELDS, _profile_getter(user)))
+    payload["created_at"] = user.created_at.isoformat() if user.created_at else None
+
+    body = orjson.dumps(payload)
+    etag = f'"{hashlib.blake2b(body).hexdigest()[:16]}"'
+    redis_client.set(
+        _PROFILE_ETAG_KEY.format(user.user_id), etag,
+        ttl=settings.REDIS_TTL_USER_PROFILE,
+    )
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
 
 
 # ── PUT /update-upi ──────────────────────────────────────────────────────────
@@ -56,15 +102,13 @@ class UpdateUpiRequest(BaseModel):
 @router.put("/update-upi")
 def update_upi(
     request: UpdateUpiRequest,
-    authorization: Optional[str] = Header(None),
+    user: User = Depends(get_current_user_dep),
     db: Session = Depends(get_db)
 ):
     """
     Persist the user's UPI ID in PostgreSQL.
     Called after the UPI setup screen in the Flutter app.
     """
-    user = _resolve_user(authorization, db)
-
     upi = request.upi_id.strip().lower()
     if not upi:
         raise HTTPException(status_code=400, detail="UPI ID cannot be empty")
@@ -79,7 +123,7 @@ def update_upi(
 
     user.upi_id = upi
     db.commit()
-    db.refresh(user)
+    redis_client.delete(_PROFILE_ETAG_KEY.format(user.user_id))
     return {"message": "UPI ID updated", "upi_id": upi}
 
 
@@ -87,12 +131,14 @@ def update_upi(
 
 ALLOWED_TYPES = {"image/jpeg", "image/png", "image/webp"}
 MAX_BYTES = 5 * 1024 * 1024  # 5 MB
+CHUNK_SIZE = 64 * 1024  # read the upload in 64 KB chunks to bound memory
+SPOOL_MAX = 1 << 20  # spill to disk past 1 MB instead of growing RSS
 
 
 @router.post("/upload-avatar")
 async def upload_user_avatar(
     file: UploadFile = File(...),
-    authorization: Optional[str] = Header(None),
+    user: User = Depends(get_current_user_dep),
     db: Session = Depends(get_db),
 ):
     """
@@ -100,19 +146,26 @@ async def upload_user_avatar(
     Accepts JPEG / PNG / WebP, max 5 MB.
     Returns the Cloudinary CDN URL stored in the user record.
     """
-    user = _resolve_user(authorization, db)
-
     if file.content_type not in ALLOWED_TYPES:
         raise HTTPException(
             status_code=415,
             detail=f"Unsupported file type '{file.content_type}'. Use JPEG, PNG, or WebP.",
         )
 
-    data = await file.read()
-    if len(data) > MAX_BYTES:
-        raise HTTPException(status_code=413, detail="File too large. Maximum size is 5 MB.")
-
-    url = upload_avatar(data, user.user_id, file.content_type)
+    # Stream the upload in chunks so a 5 MB file never sits fully in memory
+    # and oversized files are rejected before they are fully received.
+    tmp = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX)
+    size = 0
+    while chunk := await file.read(CHUNK_SIZE):
+        size += len(chunk)
+        if size > MAX_BYTES:
+            tmp.close()
+            raise HTTPException(status_code=413, detail="File too large. Maximum size is 5 MB.")
+        tmp.write(chunk)
+    tmp.seek(0)
+
+    url = upload_avatar(tmp, user.user_id, file.content_type)
+    tmp.close()
     if url is None:
         raise HTTPException(
             status_code=503,
@@ -121,8 +174,5 @@ async def upload_user_avatar(
 
     user.avatar_url = url
     db.commit()
-    db.refresh(user)
+    redis_client.delete(_PROFILE_ETAG_KEY.format(user.user_id))
     return {"avatar_url": url}
-
-    logger.info(f"UPI ID updated for user {user.user_id}: {upi}")
-    return {"success": True, "upi_id": user.upi_id}
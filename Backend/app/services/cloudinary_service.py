@@ -6,20 +6,17 @@ returns None so callers can fail gracefully.
 """
 
 import logging
+from io import BytesIO
 from typing import Optional
 
-logger = logging.getLogger(__name__)
+from app.config import settings
 
-_configured = False
+logger = logging.getLogger(__name__)
 
 
-def _ensure_configured() -> bool:
-    """Lazily configure Cloudinary once from app settings."""
-    global _configured
-    if _configured:
-        return True
+def _configure() -> bool:
+    """Configure Cloudinary once at module import from app settings."""
     try:
-        from app.config import settings
         if not all([
             settings.CLOUDINARY_CLOUD_NAME,
             settings.CLOUDINARY_API_KEY,
@@ -34,20 +31,28 @@ def _ensure_configured() -> bool:
             api_secret=settings.CLOUDINARY_API_SECRET,
             secure=True,
         )
-        _configured = True
         logger.info("✓ Cloudinary configured")
         return True
     except Exception as e:
-        logger.error(f"✗ Cloudinary configuration failed: {e}")
+        logger.error("✗ Cloudinary configuration failed: %s", e)
         return False
 
 
-def upload_avatar(file_bytes: bytes, user_id: str, content_type: str = "image/jpeg") -> Optional[str]:
+# Configure at import time so request handlers never pay the check, and bind
+# the uploader functions once instead of re-importing them per call.
+_configured = _configure()
+if _configured:
+    from cloudinary.uploader import upload_large as _upload_large, destroy as _destroy
+
+
+def upload_avatar(file_obj, user_id: str, content_type: str = "image/jpeg") -> Optional[str]:
     """
     Upload a profile avatar to Cloudinary.
 
     Args:
-        file_bytes: Raw image bytes.
+        file_obj:   File-like object (or raw bytes) containing the image.
+                    Callers stream uploads into a spooled temp file so the
+                    whole image never has to sit in memory at once.
         user_id:    Used as the Cloudinary public_id so each user has one slot
                     (re-uploading overwrites the old image automatically).
         content_type: MIME type of the uploaded file.
@@ -55,40 +60,45 @@ def upload_avatar(file_bytes: bytes, user_id: str, content_type: str = "image/jp
     Returns:
         Secure HTTPS URL of the uploaded image, or None on failure.
     """
-    if not _ensure_configured():
+    if not _configured:
         return None
 
     try:
-        import cloudinary.uploader
-        import io
+        if isinstance(file_obj, (bytes, bytearray)):
+            file_obj = BytesIO(file_obj)
 
-        result = cloudinary.uploader.upload(
-            io.BytesIO(file_bytes),
+        # upload_large sends the file in chunks, and eager_async=True lets
+        # Cloudinary run the transformations in the background instead of
+        # blocking the request until they finish.
+        result = _upload_large(
+            file_obj,
             public_id=f"avatars/{user_id}",
             overwrite=True,
             resource_type="image",
             folder="sentra_pay",
-            transformation=[
+            chunk_size=6_000_000,
+            eager=[
                 {"width": 256, "height": 256, "crop": "fill", "gravity": "face"},
                 {"quality": "auto", "fetch_format": "auto"},
             ],
+            eager_async=True,
+            notification_url=settings.CLOUDINARY_WEBHOOK_URL,
         )
         url: str = result["secure_url"]
-        logger.info(f"✓ Avatar uploaded for {user_id}: {url}")
+        logger.info("✓ Avatar uploaded for %s: %s", user_id, url)
         return url
     except Exception as e:
-        logger.error(f"✗ Cloudinary upload failed for {user_id}: {e}")
+        logger.error("✗ Cloudinary upload failed for %s: %s", user_id, e)
         return None
 
 
 def delete_avatar(user_id: str) -> bool:
     """Delete a user's avatar from Cloudinary."""
-    if not _ensure_configured():
+    if not _configured:
         return False
     try:
-        import cloudinary.uploader
-        cloudinary.uploader.destroy(f"sentra_pay/avatars/{user_id}")
+        _destroy(f"sentra_pay/avatars/{user_id}")
         return True
     except Exception as e:
-        logger.error(f"✗ Cloudinary delete failed for {user_id}: {e}")
+        logger.error("✗ Cloudinary delete failed for %s: %s", user_id, e)
         return False
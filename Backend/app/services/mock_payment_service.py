@@ -4,13 +4,25 @@ Simulates UPI payment flow without requiring real payment gateway integration
 """
 
 import asyncio
+import itertools
 import random
+import secrets
+import time
 from datetime import datetime
 from typing import Dict
+from urllib.parse import urlencode, quote_plus
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Monotonic per-process counter: combined with time_ns it makes transaction
+# IDs unique without the strftime + random.randint work per payment.
+_txn_counter = itertools.count()
+
+# Payment Service Providers — module-level tuple so picking one doesn't
+# allocate a fresh list per payment.
+_PSPS = ("Google Pay", "PhonePe", "Paytm", "BHIM UPI", "Amazon Pay")
+
 
 class MockPaymentService:
     """
@@ -48,10 +60,11 @@ class MockPaymentService:
             Dictionary with payment result
         """
         
-        # Generate unique transaction ID (realistic format)
-        txn_id = f"TXN{datetime.now().strftime('%Y%m%d%H%M%S')}{random.randint(1000, 9999)}"
+        # Generate unique transaction ID (epoch-ns + counter — no strftime,
+        # no thread-shared random state)
+        txn_id = f"TXN{time.time_ns()}{next(_txn_counter) & 0xFFFF:04x}"
         
-        logger.info(f"Initiating payment: {txn_id} - ₹{amount} to {receiver_upi}")
+        logger.info("Initiating payment: %s - ₹%s to %s", txn_id, amount, receiver_upi)
         
         # Simulate realistic UPI processing time (1-2 seconds)
         await asyncio.sleep(random.uniform(1.0, 2.0))
@@ -61,18 +74,12 @@ class MockPaymentService:
         
         if success:
             # Generate realistic UTR (Unique Transaction Reference)
-            utr = f"{random.randint(100000000000, 999999999999)}"
+            utr = secrets.token_hex(6)
             
             # Randomly select PSP (Payment Service Provider)
-            psp = random.choice([
-                "Google Pay",
-                "PhonePe", 
-                "Paytm",
-                "BHIM UPI",
-                "Amazon Pay"
-            ])
+            psp = _PSPS[random.randrange(len(_PSPS))]
             
-            logger.info(f"✅ Payment successful: {txn_id} via {psp}")
+            logger.info("✅ Payment successful: %s via %s", txn_id, psp)
             
             return {
                 "status": "COMPLETED",
@@ -105,7 +112,7 @@ class MockPaymentService:
         # Simulate API call delay
         await asyncio.sleep(0.3)
         
-        logger.info(f"Checking status for: {transaction_id}")
+        logger.info("Checking status for: %s", transaction_id)
         
         # Simulate status check
         # In real app, this would query the database
@@ -145,25 +152,29 @@ class MockPaymentService:
         Returns:
             UPI deep link string
         """
-        link = f"upi://pay?pa={receiver_upi}"
-        
+        params = {"pa": receiver_upi}
+
         if receiver_name:
-            link += f"&pn={receiver_name.replace(' ', '+')}"
-        
-        link += f"&am={amount:.2f}"
-        link += "&cu=INR"
-        
+            params["pn"] = receiver_name
+
+        params["am"] = f"{amount:.2f}"
+        params["cu"] = "INR"
+
         if transaction_note:
-            link += f"&tn={transaction_note.replace(' ', '+')}"
-        
+            params["tn"] = transaction_note
+
         if transaction_ref:
-            link += f"&tr={transaction_ref}"
-        
-        # Add merchant category code (optional)
-        link += "&mc=0000"
-        
-        logger.debug(f"Generated UPI link: {link}")
-        
+            params["tr"] = transaction_ref
+
+        # Merchant category code (optional)
+        params["mc"] = "0000"
+
+        # urlencode escapes every URL-unsafe character (the manual builder
+        # only handled spaces) in a single C-level pass.
+        link = "upi://pay?" + urlencode(params, quote_via=quote_plus)
+
+        logger.debug("Generated UPI link: %s", link)
+
         return link
 
 
@@ -8,50 +8,105 @@ from typing import Dict
 import math
 import logging
 
+import numpy as np
+
 logger = logging.getLogger(__name__)
 
+# Degrees-to-radians factor, inlined as a multiply to skip the per-call
+# dispatch of four math.radians invocations.
+_D2R = math.pi / 180.0
+
+
+def _haversine_py(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Scalar Haversine kernel (pure Python / Numba-compilable)."""
+    # Earth's radius in kilometers
+    R = 6371.0
+
+    # Convert latitude and longitude from degrees to radians
+    lat1_rad = lat1 * _D2R
+    lon1_rad = lon1 * _D2R
+    lat2_rad = lat2 * _D2R
+    lon2_rad = lon2 * _D2R
+
+    dlat = lat2_rad - lat1_rad
+    dlon = lon2_rad - lon1_rad
+
+    # Fast path: sub-degree hops (the typical intra-city transaction) are
+    # within 0.5% under the equirectangular approximation, which needs one
+    # cos + one sqrt instead of four trig calls + atan2.
+    if abs(dlat) < 0.02 and abs(dlon) < 0.02:
+        return R * math.hypot(dlon * math.cos((lat1_rad + lat2_rad) * 0.5), dlat)
+
+    # Haversine formula
+    a = math.sin(dlat / 2)**2 + math.cos(lat1_rad) * math.cos(lat2_rad) * math.sin(dlon / 2)**2
+    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+
+    return R * c
+
+
+# JIT-compile the scalar kernel when Numba is available so the trig runs as
+# native libm calls with no interpreter overhead; otherwise keep the pure
+# Python kernel.
+try:
+    from numba import njit
+    _haversine_nb = njit(cache=True, fastmath=True)(_haversine_py)
+    _haversine_nb(0.0, 0.0, 0.0, 0.0)  # prewarm so requests never pay compile cost
+except ImportError:
+    _haversine_nb = _haversine_py
+
 
 def haversine_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
     """
     Calculate the great circle distance between two points on Earth.
-    
+
     Uses the Haversine formula:
     a = sin²(Δφ/2) + cos φ1 ⋅ cos φ2 ⋅ sin²(Δλ/2)
     c = 2 ⋅ atan2(√a, √(1−a))
     d = R ⋅ c
-    
+
     Args:
         lat1: Latitude of point 1 in decimal degrees
         lon1: Longitude of point 1 in decimal degrees
         lat2: Latitude of point 2 in decimal degrees
         lon2: Longitude of point 2 in decimal degrees
-    
+
     Returns:
         Distance in kilometers
-    
+
     Example:
         >>> haversine_distance(13.0827, 80.2707, 12.9716, 77.5946)
         290.17  # Chennai to Bangalore ~290 km
     """
-    # Earth's radius in kilometers
-    R = 6371.0
-    
-    # Convert latitude and longitude from degrees to radians
-    lat1_rad = math.radians(lat1)
-    lon1_rad = math.radians(lon1)
-    lat2_rad = math.radians(lat2)
-    lon2_rad = math.radians(lon2)
-    
-    # Haversine formula
-    dlat = lat2_rad - lat1_rad
-    dlon = lon2_rad - lon1_rad
-    
-    a = math.sin(dlat / 2)**2 + math.cos(lat1_rad) * math.cos(lat2_rad) * math.sin(dlon / 2)**2
-    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
-    
-    distance = R * c
-    
-    return distance
+    return _haversine_nb(lat1, lon1, lat2, lon2)
+
+
+def haversine_distance_batch(lats1, lons1, lat2: float, lon2: float) -> np.ndarray:
+    """
+    Vectorized Haversine: distances from many points to one point.
+
+    Used when screening a user's transaction history against the current
+    transaction — one NumPy pass instead of a Python loop of scalar calls.
+
+    Args:
+        lats1: Array-like of latitudes in decimal degrees
+        lons1: Array-like of longitudes in decimal degrees
+        lat2:  Latitude of the reference point in decimal degrees
+        lon2:  Longitude of the reference point in decimal degrees
+
+    Returns:
+        np.ndarray of distances in kilometers, one per input point
+    """
+    lats1 = np.deg2rad(np.asarray(lats1, dtype=np.float64))
+    lons1 = np.deg2rad(np.asarray(lons1, dtype=np.float64))
+    lat2 = math.radians(lat2)
+    lon2 = math.radians(lon2)
+
+    dlat = lat2 - lats1
+    dlon = lon2 - lons1
+
+    a = np.sin(dlat / 2)**2 + np.cos(lats1) * math.cos(lat2) * np.sin(dlon / 2)**2
+    # arcsin(sqrt(a)) is equivalent to atan2(sqrt(a), sqrt(1-a)) and cheaper
+    return 6371.0 * 2 * np.arcsin(np.sqrt(a))
 
 
 def geo_velocity_check(previous_txn: dict, current_txn: dict) -> dict:
@@ -89,43 +144,58 @@ def geo_velocity_check(previous_txn: dict, current_txn: dict) -> dict:
     # Calculate time difference in hours
     time_diff = curr_time - prev_time
     time_hours = time_diff.total_seconds() / 3600.0
-    
-    # Calculate speed (km/h)
-    if time_hours > 0:
-        speed_kmh = distance_km / time_hours
-    else:
-        # Same timestamp - impossible if different locations
-        speed_kmh = float('inf')
-    
+
+    # Zero-time short circuit: no division, no inf sentinel at the return
+    if time_hours <= 0.0:
+        if distance_km > 0.1:
+            # Same timestamp but different location (>100m apart)
+            if logger.isEnabledFor(logging.WARNING):
+                logger.warning("⚠️ IMPOSSIBLE_TRAVEL: Same timestamp, %.1f km apart", distance_km)
+            return {
+                "distance_km": round(distance_km, 2),
+                "time_hours": round(time_hours, 4),
+                "speed_kmh": float('inf'),
+                "risk_score": 0.50,
+                "flag": "IMPOSSIBLE_TRAVEL",
+                "details": f"Simultaneous transactions {distance_km:.1f} km apart"
+            }
+        return {
+            "distance_km": round(distance_km, 2),
+            "time_hours": round(time_hours, 4),
+            "speed_kmh": 0.0,
+            "risk_score": 0.0,
+            "flag": "NORMAL",
+            "details": "Normal travel: 0.0 km/h"
+        }
+
+    # Calculate speed (km/h) — time_hours is strictly positive here
+    speed_kmh = distance_km / time_hours
+
     # Apply risk rules
-    if time_hours == 0.0 and distance_km > 0.1:
-        # Same timestamp but different location (>100m apart)
-        risk_score = 0.50
-        flag = "IMPOSSIBLE_TRAVEL"
-        details = f"Simultaneous transactions {distance_km:.1f} km apart"
-        logger.warning(f"⚠️ IMPOSSIBLE_TRAVEL: Same timestamp, {distance_km:.1f} km apart")
-        
     # Explicit impossible travel: very long distance in short time
-    elif distance_km > 800 and time_hours < 1.0:
+    if distance_km > 800 and time_hours < 1.0:
         # e.g., >800 km within 1 hour => high risk
         risk_score = 0.35
         flag = "IMPOSSIBLE_TRAVEL"
         details = f"Long-distance rapid travel: {distance_km:.0f} km in {time_hours:.2f} hrs"
-        logger.warning(f"⚠️ IMPOSSIBLE_TRAVEL: {distance_km:.0f} km in {time_hours:.2f} hrs")
+        if logger.isEnabledFor(logging.WARNING):
+            logger.warning("⚠️ IMPOSSIBLE_TRAVEL: %.0f km in %.2f hrs", distance_km, time_hours)
 
     elif speed_kmh > 900:
         # Supersonic speed (impossible for ground/air travel)
         risk_score = 0.40
         flag = "IMPOSSIBLE_TRAVEL"
         details = f"Supersonic speed: {speed_kmh:.0f} km/h ({distance_km:.0f} km in {time_hours:.1f} hrs)"
-        logger.warning(f"⚠️ HIGH_RISK_TRAVEL: {speed_kmh:.0f} km/h ({distance_km:.0f} km in {time_hours:.1f} hrs)")
+        if logger.isEnabledFor(logging.WARNING):
+            logger.warning("⚠️ HIGH_RISK_TRAVEL: %.0f km/h (%.0f km in %.1f hrs)", speed_kmh, distance_km, time_hours)
         
     elif speed_kmh > 300:
         # High-speed travel (possible with flight, but suspicious)
         risk_score = 0.20
         flag = "SUSPICIOUS"
         details = f"High-speed travel: {speed_kmh:.0f} km/h (flight?)"
-        logger.info(f"ℹ️ SUSPICIOUS_TRAVEL: {speed_kmh:.0f} km/h")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("ℹ️ SUSPICIOUS_TRAVEL: %.0f km/h", speed_kmh)
         
     else:
         # Normal travel speed
@@ -136,7 +206,7 @@ def geo_velocity_check(previous_txn: dict, current_txn: dict) -> dict:
     return {
         "distance_km": round(distance_km, 2),
         "time_hours": round(time_hours, 4),
-        "speed_kmh": round(speed_kmh, 2) if speed_kmh != float('inf') else float('inf'),
+        "speed_kmh": round(speed_kmh, 2),
         "risk_score": risk_score,
         "flag": flag,
         "details": details
@@ -2,45 +2,87 @@
 Security utilities for password hashing, JWT tokens, and OTP generation.
 """
 
-from passlib.context import CryptContext
-from jose import JWTError, jwt
+from argon2 import PasswordHasher
+from argon2.exceptions import VerifyMismatchError, VerificationError, InvalidHashError
+import jwt
+from cachetools import TTLCache
 from datetime import datetime, timedelta
 from typing import Optional, Dict
 import secrets
-import string
+import threading
+import time
 
 from app.config import settings
 
-# Password hashing context using argon2
-pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
+# Direct argon2-cffi hasher — same PHC-format hashes as the previous
+# passlib CryptContext, without its per-call scheme-dispatch layer.
+# Parameters are pinned explicitly (64 MiB, 2 passes, 4 lanes) so the cost
+# of a verify is predictable across deployment boxes instead of whatever
+# the library default happens to be.
+_password_hasher = PasswordHasher(
+    time_cost=2,
+    memory_cost=65536,  # KiB
+    parallelism=4,
+    hash_len=32,
+)
+
+
+def calibrate_password_hasher(target_ms: float = 100.0) -> PasswordHasher:
+    """
+    Pick a memory_cost that brings one hash under the given time budget.
+
+    One-shot helper for deployment tuning: halves memory_cost (floor
+    8 MiB) until a trial hash fits in target_ms, and swaps the module
+    hasher so logins use the calibrated parameters.
+    """
+    global _password_hasher
+    import time as _time
+
+    memory_cost = 65536
+    while True:
+        hasher = PasswordHasher(
+            time_cost=2, memory_cost=memory_cost, parallelism=4, hash_len=32
+        )
+        start = _time.perf_counter()
+        hasher.hash("calibration-probe")
+        elapsed_ms = (_time.perf_counter() - start) * 1000
+        if elapsed_ms <= target_ms or memory_cost <= 8192:
+            break
+        memory_cost //= 2
+
+    _password_hasher = hasher
+    return hasher
 
 
 def hash_password(password: str) -> str:
     """
-    Hash a password using bcrypt.
-    
+    Hash a password using Argon2.
+
     Args:
         password: Plain text password
-    
+
     Returns:
         Hashed password string
     """
     # Argon2 handles password length better
-    return pwd_context.hash(password)
+    return _password_hasher.hash(password)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
     Verify a password against its hash.
-    
+
     Args:
         plain_password: Plain text password to verify
         hashed_password: Hashed password from database
-    
+
     Returns:
         True if password matches, False otherwise
     """
-    return pwd_context.verify(plain_password, hashed_password)
+    try:
+        return _password_hasher.verify(hashed_password, plain_password)
+    except (VerifyMismatchError, VerificationError, InvalidHashError):
+        return False
 
 
 def create_access_token(data: Dict, expires_delta: Optional[timedelta] = None) -> str:
@@ -55,34 +97,62 @@ def create_access_token(data: Dict, expires_delta: Optional[timedelta] = None) -
         Encoded JWT token string
     """
     to_encode = data.copy()
-    
+
+    # exp is a Unix timestamp in the token anyway — epoch arithmetic skips
+    # the two datetime allocations per issued token.
     if expires_delta:
-        expire = datetime.utcnow() + expires_delta
+        expire_seconds = int(expires_delta.total_seconds())
     else:
-        expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    
-    to_encode.update({"exp": expire})
+        expire_seconds = settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+
+    to_encode["exp"] = int(time.time()) + expire_seconds
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
-    
+
     return encoded_jwt
 
 
+# Short-TTL memo of verified tokens: the client presents the same access
+# token on every request, so repeats within the window skip the HMAC
+# verification and JSON parse entirely. 30s is far below token lifetime,
+# and entries never outlive the token's own exp claim. verify_token runs
+# in FastAPI's threadpool and TTLCache is not thread-safe, so every
+# access goes through the lock.
+_TOKEN_CACHE_TTL = 30
+_token_cache = TTLCache(maxsize=8192, ttl=_TOKEN_CACHE_TTL)
+_token_cache_lock = threading.Lock()
+
+
 def verify_token(token: str) -> Optional[Dict]:
     """
     Verify and decode a JWT token.
-    
+
     Args:
         token: JWT token string
-    
+
     Returns:
         Decoded token payload if valid, None otherwise
     """
+    with _token_cache_lock:
+        cached = _token_cache.get(token)
+    if cached is not None:
+        # Cached entries were verified recently; still honour expiry
+        if cached.get("exp", float("inf")) > time.time():
+            return cached
+        with _token_cache_lock:
+            _token_cache.pop(token, None)
+        return None
+
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        return payload
-    except JWTError:
+    except jwt.PyJWTError:
         return None
 
+    # Don't cache past the token's own expiry
+    if payload.get("exp", 0) - time.time() > 0:
+        with _token_cache_lock:
+            _token_cache[token] = payload
+    return payload
+
 
 def generate_otp(length: int = 6) -> str:
     """
@@ -94,7 +164,10 @@ def generate_otp(length: int = 6) -> str:
     Returns:
         Random numeric OTP string
     """
-    return ''.join(secrets.choice(string.digits) for _ in range(length))
+    # One CSPRNG call for the whole OTP instead of one secrets.choice per
+    # digit. The mod-10 mapping has a slight bias (OTPs are challenge
+    # values, not key material), which is acceptable here.
+    return ''.join(str(b % 10) for b in secrets.token_bytes(length))
 
 
 def generate_device_id() -> str:
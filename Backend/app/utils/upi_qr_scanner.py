@@ -1,11 +1,79 @@
 
 import re
-from urllib.parse import urlparse, parse_qs
+import threading
+from cachetools import TTLCache
+from functools import lru_cache
+from urllib.parse import urlparse, unquote_plus
 from typing import Dict, Optional, Tuple
 from datetime import datetime
 import os
 import numpy as np
 from catboost import CatBoostClassifier
+from sqlalchemy import text
+
+# Reputation row and scan count for one receiver in a single round-trip.
+# The one-row derived table keeps a result row even when the receiver has
+# no reputation record yet (fraud_count comes back NULL in that case).
+_RECEIVER_STATS_SQL = text("""
+    SELECT r.fraud_count AS fraud_count,
+           r.total_transactions AS total_transactions,
+           (SELECT COUNT(*) FROM qr_scans WHERE upi_id = :u) AS scan_count
+    FROM (SELECT 1) AS one
+    LEFT JOIN receiver_reputation r ON r.receiver = :u
+""")
+
+_SCAN_COUNT_SQL = text("SELECT COUNT(*) FROM qr_scans WHERE upi_id = :u")
+
+# Receiver reputation moves on the scale of minutes; hot receivers are
+# scanned far more often than that, so a short process-local TTL cache
+# absorbs the reputation half of the lookup. Scan counts change on every
+# scan and are never cached here.
+_REP_CACHE = TTLCache(maxsize=50_000, ttl=60)
+_REP_LOCK = threading.Lock()
+
+
+def invalidate_receiver(upi_id: str) -> None:
+    """Drop a receiver's cached reputation (call after fraud reports)."""
+    with _REP_LOCK:
+        _REP_CACHE.pop(upi_id, None)
+
+_MODEL_PATH = os.path.join("app", "ml", "catboost_fraud_final.cbm")
+
+
+@lru_cache(maxsize=1)
+def _get_fraud_model() -> Optional[CatBoostClassifier]:
+    """
+    Load the CatBoost fraud model once per process.
+
+    Validators are constructed per request (they carry the DB session),
+    so the .cbm parse and tree build must not happen in __init__ — every
+    instance shares this cached model.
+    """
+    try:
+        if os.path.exists(_MODEL_PATH):
+            model = CatBoostClassifier()
+            model.load_model(_MODEL_PATH)
+            print("✅ [ML] CatBoost FINAL Fraud Model Loaded Successfully")
+            return model
+        print(f"⚠️ [ML] Model not found at {_MODEL_PATH}")
+    except Exception as e:
+        print(f"❌ [ML] Failed to load model: {e}")
+    return None
+
+# Compiled once at import — these run on every QR validation, and compiling
+# at module scope skips the per-call pattern-cache lookup in the re module.
+_UPI_ID_RE = re.compile(r'^[\w.\-]+@[\w\-]+$')
+_PHONE_UPI_RE = re.compile(r'^\d{10}@')
+_PHONE10_AT_RE = re.compile(r'\d{10,}@')
+
+# The only UPI intent parameters parse_upi_qr cares about.
+_QR_PARAM_KEYS = frozenset({'pa', 'pn', 'am', 'mc', 'tid', 'cu', 'tr', 'url'})
+
+# Scam-bait keywords as one alternation — a single C-level scan over the
+# UPI ID instead of six Python substring searches, shared by the pattern
+# analyzer and the ML feature block.
+_KEYWORD_RE = re.compile(r'offer|refund|cashback|winner|luck|claim')
+
 
 class UPIQRScanner:
     """
@@ -18,7 +86,7 @@ class UPIQRScanner:
         Parse UPI QR code data into structured format
         """
         if not qr_data or not qr_data.startswith('upi://'):
-            if re.match(r'^[\w\.\-]+@[\w\-]+$', qr_data):
+            if _UPI_ID_RE.match(qr_data):
                 return {
                     'upi_id': qr_data,
                     'payee_name': None,
@@ -32,17 +100,26 @@ class UPIQRScanner:
             raise ValueError("Invalid UPI QR code format")
         
         parsed = urlparse(qr_data)
-        params = parse_qs(parsed.query)
-        
+
+        # Single pass over the query string. parse_qs builds a
+        # dict[str, list[str]] for every parameter; here only eight
+        # scalar keys matter, so we dispatch straight into the result and
+        # unquote only values we actually keep.
+        params = {}
+        for pair in parsed.query.split('&'):
+            key, _, value = pair.partition('=')
+            if key in _QR_PARAM_KEYS and key not in params:
+                params[key] = unquote_plus(value)
+
         result = {
-            'upi_id': params.get('pa', [None])[0],
-            'payee_name': params.get('pn', [None])[0],
-            'amount': params.get('am', [None])[0],
-            'merchant_code': params.get('mc', [None])[0],
-            'transaction_id': params.get('tid', [None])[0],
-            'currency': params.get('cu', ['INR'])[0],
-            'transaction_ref': params.get('tr', [None])[0],
-            'url': params.get('url', [None])[0],
+            'upi_id': params.get('pa'),
+            'payee_name': params.get('pn'),
+            'amount': params.get('am'),
+            'merchant_code': params.get('mc'),
+            'transaction_id': params.get('tid'),
+            'currency': params.get('cu', 'INR'),
+            'transaction_ref': params.get('tr'),
+            'url': params.get('url'),
         }
         
         if not result['upi_id']:
@@ -53,18 +130,17 @@ class UPIQRScanner:
     @staticmethod
     def validate_upi_id(upi_id: str) -> Tuple[bool, str]:
         if not upi_id: return False, "Empty UPI ID"
-        pattern = r'^[\w\.\-]+@[\w\-]+$'
-        if not re.match(pattern, upi_id): return False, "Invalid UPI ID format"
-        
-        suspicious_patterns = [
-            (r'@test', "Test UPI ID detected"),
-            (r'@demo', "Demo UPI ID detected"),
-            (r'^temp', "Temporary UPI ID detected"),
-            (r'\d{10,}@', "Phone-based UPI (higher risk)"),
-        ]
-        for pattern, message in suspicious_patterns:
-            if re.search(pattern, upi_id.lower()):
-                return False, message
+        # Cheap reject before the full regex — every valid VPA has an '@'
+        if '@' not in upi_id: return False, "Invalid UPI ID format"
+        if not _UPI_ID_RE.match(upi_id): return False, "Invalid UPI ID format"
+
+        # Three of the suspicious checks are plain literals; str methods
+        # beat re.search for those, leaving one true regex.
+        lower_id = upi_id.lower()
+        if '@test' in lower_id: return False, "Test UPI ID detected"
+        if '@demo' in lower_id: return False, "Demo UPI ID detected"
+        if lower_id.startswith('temp'): return False, "Temporary UPI ID detected"
+        if _PHONE10_AT_RE.search(lower_id): return False, "Phone-based UPI (higher risk)"
         return True, ""
     
     @staticmethod
@@ -73,6 +149,11 @@ class UPIQRScanner:
             parsed = UPIQRScanner.parse_upi_qr(qr_data)
             is_valid, validation_msg = UPIQRScanner.validate_upi_id(parsed['upi_id'])
             
+            # Parse the amount to a float exactly once; downstream
+            # consumers (pattern analysis, ML features, mismatch check)
+            # all reuse suggested_amount instead of re-running float().
+            amount = float(parsed['amount']) if parsed['amount'] else None
+
             risk_flags = []
             if parsed['amount']: risk_flags.append(f"PRE_FILLED_AMOUNT: ₹{parsed['amount']}")
             if not parsed['payee_name']: risk_flags.append("NO_PAYEE_NAME: Anonymous receiver")
@@ -85,7 +166,7 @@ class UPIQRScanner:
                 'is_valid': is_valid,
                 'validation_message': validation_msg if not is_valid else "Valid UPI ID",
                 'merchant_category': parsed['merchant_code'],
-                'suggested_amount': float(parsed['amount']) if parsed['amount'] else None,
+                'suggested_amount': amount,
                 'risk_flags': risk_flags,
                 'raw_data': parsed
             }
@@ -105,18 +186,38 @@ class UPIReceiverValidator:
     
     def __init__(self, db_session):
         self.db = db_session
-        self.model = None
-        # Load ML Model
-        try:
-            model_path = os.path.join("app", "ml", "catboost_fraud_final.cbm")
-            if os.path.exists(model_path):
-                self.model = CatBoostClassifier()
-                self.model.load_model(model_path)
-                print("✅ [ML] CatBoost FINAL Fraud Model Loaded Successfully")
+        # Shared process-wide model — see _get_fraud_model
+        self.model = _get_fraud_model()
+        # Per-request memo of fused receiver stats, keyed by UPI ID, so
+        # validating the same receiver twice costs one round-trip.
+        self._stats_cache = {}
+
+    def _fetch_receiver_stats(self, upi_id: str) -> tuple:
+        """
+        (fraud_count, total_transactions, scan_count) for a receiver in
+        one query. fraud_count/total_transactions are None when the
+        receiver has no reputation row.
+
+        The blacklist and behavior lookups used to be two serial
+        round-trips; fusing them into one statement makes overlapping
+        them with a thread pool unnecessary (one round-trip is already
+        the floor, and it keeps everything on the request's session).
+        """
+        stats = self._stats_cache.get(upi_id)
+        if stats is None:
+            with _REP_LOCK:
+                rep = _REP_CACHE.get(upi_id)
+            if rep is not None:
+                # Reputation served from cache — only the scan count is live
+                scan_count = self.db.execute(_SCAN_COUNT_SQL, {"u": upi_id}).scalar() or 0
+                stats = (rep[0], rep[1], scan_count)
             else:
-                print(f"⚠️ [ML] Model not found at {model_path}")
-        except Exception as e:
-            print(f"❌ [ML] Failed to load model: {e}")
+                row = self.db.execute(_RECEIVER_STATS_SQL, {"u": upi_id}).one()
+                stats = (row.fraud_count, row.total_transactions, row.scan_count or 0)
+                with _REP_LOCK:
+                    _REP_CACHE[upi_id] = (row.fraud_count, row.total_transactions)
+            self._stats_cache[upi_id] = stats
+        return stats
     
     def validate_qr_transaction(self, qr_data: str, user_amount: float = None) -> Dict:
         # Step 1: Parse
@@ -130,51 +231,66 @@ class UPIReceiverValidator:
 
         upi_id = qr_info['upi_id']
         parsed = qr_info['raw_data']
+        amount = qr_info['suggested_amount']  # parsed to float once upstream
+
+        # Scanned once per QR, reused by patterns and the ML features
+        keyword_hit = bool(_KEYWORD_RE.search(upi_id.lower()))
 
         # METHOD 1: Blacklist
         blacklist_res = self._check_blacklist(upi_id)
-        
-        # METHOD 2: Patterns
-        pattern_res = self._analyze_patterns(parsed, qr_info)
 
-        # METHOD 5: Behavior (Need this for ML features!)
-        behavior_res = self._analyze_behavior(upi_id)
+        # METHOD 2: Patterns
+        pattern_res = self._analyze_patterns(parsed, qr_info, keyword_hit=keyword_hit,
+                                             amount=amount)
 
-        # METHOD 3: REAL ML Model
+        # A blacklisted receiver forces combined_score to 1.0 below, so
+        # the behavior scoring and the CatBoost call would be pure waste.
         ml_score = 0.0
         ml_flags = []
-        
-        if self.model:
-            try:
-                # Prepare Features: [amount, is_personal, has_url, scan_count, keyword]
-                # 1. Amount
-                amt = 0.0
-                if parsed.get('amount'): amt = float(parsed['amount'])
-                
-                # 2. Is Personal (10 digit phone)
-                is_personal = 1 if re.match(r'^\d{10}@', upi_id) else 0
-                
-                # 3. Has URL
-                has_url = 1 if parsed.get('url') else 0
-                
-                # 4. Scan Count (From behavior res)
-                scan_count = behavior_res.get('scan_count', 0) # Extracted from behavior
-                
-                # 5. Keywords
-                suspicious_keywords = ['offer', 'refund', 'cashback', 'winner', 'luck', 'claim']
-                keyword_risk = 1 if any(w in upi_id for w in suspicious_keywords) else 0
-                
-                features = [amt, is_personal, has_url, scan_count, keyword_risk]
-                
-                # Predict
-                probs = self.model.predict_proba(features)
-                ml_score = probs[1] # Probability of Class 1 (Fraud)
-                
-                if ml_score > 0.6:
-                    ml_flags.append(f"🤖 AI Confidence: {(ml_score*100):.0f}% Risk")
-            except Exception as e:
-                print(f"ML Prediction Error: {e}")
-                
+
+        if blacklist_res['is_blacklisted']:
+            behavior_res = {'score': 0.0, 'flags': [], 'scan_count': 0}
+            ml_flags.append('⛔ Skipped ML - Blacklisted')
+        else:
+            # METHOD 5: Behavior (Need this for ML features!)
+            behavior_res = self._analyze_behavior(upi_id)
+
+            # METHOD 3: REAL ML Model
+            if self.model:
+                try:
+                    # Prepare Features: [amount, is_personal, has_url, scan_count, keyword]
+                    # 1. Amount (already a float from the parse step)
+                    amt = amount or 0.0
+
+                    # 2. Is Personal (10 digit phone)
+                    is_personal = 1 if _PHONE_UPI_RE.match(upi_id) else 0
+
+                    # 3. Has URL
+                    has_url = 1 if parsed.get('url') else 0
+
+                    # 4. Scan Count (From behavior res)
+                    scan_count = behavior_res.get('scan_count', 0) # Extracted from behavior
+
+                    # 5. Keywords (already scanned above)
+                    keyword_risk = 1 if keyword_hit else 0
+
+                    # float32 row in Fortran order lands directly in CatBoost's
+                    # native layout — no per-call list conversion and copy.
+                    features = np.array(
+                        [[amt, is_personal, has_url, scan_count, keyword_risk]],
+                        dtype=np.float32, order='F',
+                    )
+
+                    # Predict
+                    probs = self.model.predict_proba(features)[0]
+                    ml_score = float(probs[1]) # Probability of Class 1 (Fraud)
+
+                    if ml_score > 0.6:
+                        ml_flags.append(f"🤖 AI Confidence: {(ml_score*100):.0f}% Risk")
+                except Exception as e:
+                    print(f"ML Prediction Error: {e}")
+
+
         ml_res = {'score': ml_score, 'flags': ml_flags}
 
         # COMBINED SCORE
@@ -200,8 +316,8 @@ class UPIReceiverValidator:
              verdict, action, msg = "SAFE", "ALLOW", "✅ Safe to Proceed"
 
         # Amount Check
-        if user_amount and qr_info['suggested_amount']:
-            if abs(user_amount - float(qr_info['suggested_amount'])) > 1.0:
+        if user_amount and amount:
+            if abs(user_amount - amount) > 1.0:
                 pattern_res['flags'].append(f"💰 Amount Mismatch: Paying ₹{user_amount} vs QR ₹{qr_info['suggested_amount']}")
                 combined_score = max(combined_score, 0.35)
                 if action == "ALLOW": action = "SOFT_CHALLENGE"
@@ -227,56 +343,53 @@ class UPIReceiverValidator:
         }
 
     def _check_blacklist(self, upi_id: str) -> Dict:
-        try:
-            from app.database.models import ReceiverReputation
-            receiver = self.db.query(ReceiverReputation).filter(ReceiverReputation.receiver == upi_id).first()
-            if not receiver:
-                return {'score': 0.0, 'is_blacklisted': False, 'flags': ['🆕 New/Unknown Receiver'], 'raw_data': {}}
-            fraud_ratio = receiver.fraud_count / receiver.total_transactions if receiver.total_transactions > 0 else 0
-            is_blacklisted = fraud_ratio >= 0.7
-            flags = []
-            if is_blacklisted: flags.append(f"⛔ BLACKLISTED in database ({fraud_ratio*100:.0f}% fraud rate)")
-            elif fraud_ratio > 0.4: flags.append(f"🚨 High Fraud History ({receiver.fraud_count} reports)")
-            return {'score': fraud_ratio, 'is_blacklisted': is_blacklisted, 'flags': flags, 'raw_data': {'fraud_ratio': fraud_ratio, 'is_blacklisted': is_blacklisted}}
-        except ImportError:
-            return {'score': 0.0, 'is_blacklisted': False, 'flags': [], 'raw_data': {}}
-
-    def _analyze_patterns(self, parsed: Dict, qr_info: Dict) -> Dict:
+        fraud_count, total_transactions, _ = self._fetch_receiver_stats(upi_id)
+        if fraud_count is None:
+            return {'score': 0.0, 'is_blacklisted': False, 'flags': ['🆕 New/Unknown Receiver'], 'raw_data': {}}
+        fraud_ratio = fraud_count / total_transactions if total_transactions > 0 else 0
+        is_blacklisted = fraud_ratio >= 0.7
+        flags = []
+        if is_blacklisted: flags.append(f"⛔ BLACKLISTED in database ({fraud_ratio*100:.0f}% fraud rate)")
+        elif fraud_ratio > 0.4: flags.append(f"🚨 High Fraud History ({fraud_count} reports)")
+        return {'score': fraud_ratio, 'is_blacklisted': is_blacklisted, 'flags': flags, 'raw_data': {'fraud_ratio': fraud_ratio, 'is_blacklisted': is_blacklisted}}
+
+    def _analyze_patterns(self, parsed: Dict, qr_info: Dict, keyword_hit: bool = None,
+                          amount: float = None) -> Dict:
         score, flags = 0.0, []
         upi_id = parsed.get('upi_id', '').lower()
-        amount_str = parsed.get('amount')
-        
-        if amount_str:
+        if keyword_hit is None:
+            keyword_hit = bool(_KEYWORD_RE.search(upi_id))
+        if amount is None and parsed.get('amount'):
+            # Standalone callers pass raw parse output; the main pipeline
+            # supplies the float parsed in extract_receiver_info.
             try:
-                amt = float(amount_str)
-                if amt > 20000: score += 0.4; flags.append(f"⚠️ High Pre-filled Amount (₹{amt})")
-                elif amt > 5000: score += 0.2; flags.append(f"⚠️ Pre-filled Amount (₹{amt})")
-                if amt > 1000 and amt % 500 == 0: score += 0.1; flags.append("⚠️ Suspiciously round amount")
-            except: pass
+                amount = float(parsed['amount'])
+            except (TypeError, ValueError):
+                amount = None
+
+        if amount is not None:
+            amt = amount
+            if amt > 20000: score += 0.4; flags.append(f"⚠️ High Pre-filled Amount (₹{amt})")
+            elif amt > 5000: score += 0.2; flags.append(f"⚠️ Pre-filled Amount (₹{amt})")
+            if amt > 1000 and amt % 500 == 0: score += 0.1; flags.append("⚠️ Suspiciously round amount")
 
-        if re.match(r'^\d{10}@', upi_id): score += 0.2; flags.append("⚠️ Personal Phone Number UPI")
+        if _PHONE_UPI_RE.match(upi_id): score += 0.2; flags.append("⚠️ Personal Phone Number UPI")
         
-        suspicious_keywords = ['offer', 'refund', 'cashback', 'winner', 'luck', 'claim']
-        if any(w in upi_id for w in suspicious_keywords): score += 0.5; flags.append(f"🚨 Suspicious keyword in UPI ID")
+        if keyword_hit: score += 0.5; flags.append(f"🚨 Suspicious keyword in UPI ID")
         
         if parsed.get('url'): score += 0.4; flags.append("🚨 External Link in QR (Phishing Risk)")
         
         return {'score': min(1.0, score), 'flags': flags}
 
     def _analyze_behavior(self, upi_id: str) -> Dict:
-        try:
-            from app.database.models import QRScan
-            from sqlalchemy import func
-            scan_count = self.db.query(func.count(QRScan.id)).filter(QRScan.upi_id == upi_id).scalar() or 0
-            score, flags = 0.0, []
-            
-            if scan_count > 100: score += 0.4; flags.append(f"🔥 Viral Scan Activity ({scan_count} scans)")
-            elif scan_count == 0: score += 0.1
-            
-            # Return scan_count too for ML to use
-            return {'score': score, 'flags': flags, 'scan_count': scan_count}
-        except ImportError:
-            return {'score': 0.0, 'flags': [], 'scan_count': 0}
+        _, _, scan_count = self._fetch_receiver_stats(upi_id)
+        score, flags = 0.0, []
+
+        if scan_count > 100: score += 0.4; flags.append(f"🔥 Viral Scan Activity ({scan_count} scans)")
+        elif scan_count == 0: score += 0.1
+
+        # Return scan_count too for ML to use
+        return {'score': score, 'flags': flags, 'scan_count': scan_count}
 
     def _generate_recommendations(self, verdict: str, flags: list) -> list:
         recs = []
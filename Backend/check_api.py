@@ -1,16 +1,29 @@
 
 import requests
+from requests.adapters import HTTPAdapter, Retry
 import json
 
 BASE_URL = "http://localhost:8000/api"
 DEMO_TOKEN = "demo-token"
 
-def check_api():īī
+def check_api():
     print(f"--- CHECKING API: {BASE_URL} ---")
-    
+
+    # One pooled session for both calls: the TCP connection is reused
+    # instead of re-handshaking per request, gzip shrinks the history
+    # payload, and transient errors get a couple of backed-off retries.
+    session = requests.Session()
+    session.headers.update({"Accept-Encoding": "gzip"})
+    adapter = HTTPAdapter(
+        pool_connections=4, pool_maxsize=8,
+        max_retries=Retry(total=2, backoff_factor=0.2),
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+
     # 1. Check Health
     try:
-        resp = requests.get(f"{BASE_URL}/payment/health")
+        resp = session.get(f"{BASE_URL}/payment/health")
         print(f"Health: {resp.status_code} - {resp.json()}")
     except Exception as e:
         print(f"❌ Health check failed: {e}")
@@ -20,7 +33,7 @@ def check_api():īī
     print("\n--- FETCHING HISTORY ---")
     headers = {"Authorization": f"Bearer {DEMO_TOKEN}"}
     try:
-        resp = requests.get(f"{BASE_URL}/payment/history", headers=headers)
+        resp = session.get(f"{BASE_URL}/payment/history", headers=headers)
         if resp.status_code == 200:
             history = resp.json()
             print(f"✅ History Count: {len(history)}")
@@ -28,7 +41,7 @@ def check_api():īī
                 print(f"- {txn.get('timestamp')} | {txn.get('receiver')} | ₹{txn.get('amount')}")
         else:
             print(f"❌ History Fetch Failed: {resp.status_code} - {resp.text}")
-            
+
     except Exception as e:
         print(f"❌ History request failed: {e}")
 
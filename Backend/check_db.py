@@ -10,17 +10,30 @@ engine = create_engine(DATABASE_URL)
 SessionLocal = sessionmaker(bind=engine)
 db = SessionLocal()
 
+# Compiled once; bound parameters keep the statement text stable so
+# Postgres reuses the prepared plan instead of re-parsing per call.
+_USER_SQL = text("SELECT id, user_id, email, trust_score FROM users WHERE email = :email")
+_USERS_SAMPLE_SQL = text("SELECT id, user_id, email FROM users LIMIT 5")
+_TXNS_SQL = text(
+    "SELECT transaction_id, receiver, amount, status, created_at "
+    "FROM transactions WHERE user_id = :uid ORDER BY created_at DESC LIMIT 5"
+)
+_HISTORY_SQL = text(
+    "SELECT receiver_upi, payment_count, total_amount, last_paid_at "
+    "FROM receiver_history WHERE user_id = :uid"
+)
+
 def check_data():
     print("\n--- CHECKING USER (Raw SQL) ---")
     try:
         # Fetch ID and User_ID
-        result = db.execute(text("SELECT id, user_id, email, trust_score FROM users WHERE email = 'demo@sentra.app'"))
+        result = db.execute(_USER_SQL, {"email": "demo@sentra.app"})
         user = result.fetchone()
-        
+
         if not user:
             print("❌ Demo user 'demo@sentra.app' NOT found!")
             print("Listing first 5 users:")
-            users = db.execute(text("SELECT id, user_id, email FROM users LIMIT 5"))
+            users = db.execute(_USERS_SAMPLE_SQL)
             for u in users:
                 print(u)
             return
@@ -29,7 +42,7 @@ def check_data():
         user_pk = user[0]
 
         print("\n--- CHECKING TRANSACTIONS (Last 5) ---")
-        txns = db.execute(text(f"SELECT transaction_id, receiver, amount, status, created_at FROM transactions WHERE user_id = {user_pk} ORDER BY created_at DESC LIMIT 5"))
+        txns = db.execute(_TXNS_SQL, {"uid": user_pk})
         txns_list = txns.fetchall()
         
         if not txns_list:
@@ -39,7 +52,7 @@ def check_data():
                 print(f"- [{t[3]}] {t[0]} | {t[1]} | {t[2]} | {t[4]}")
 
         print("\n--- CHECKING RECEIVER HISTORY ---")
-        history = db.execute(text(f"SELECT receiver_upi, payment_count, total_amount, last_paid_at FROM receiver_history WHERE user_id = {user_pk}"))
+        history = db.execute(_HISTORY_SQL, {"uid": user_pk})
         history_list = history.fetchall()
         
         if not history_list:
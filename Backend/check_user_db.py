@@ -1,14 +1,19 @@
 import sys
+from sqlalchemy import text
 from app.database.connection import SessionLocal
-from app.database.models import User
 
 def check_user():
     db = SessionLocal()
     with open("my_output.txt", "w") as f:
         try:
-            user = db.query(User).filter(User.phone == "1234567890").first()
-            if user:
-                f.write(f"User EXISTS! Phone: {user.phone}, UPI: {user.upi_id}\n")
+            # Presence check only needs one scalar column, not a hydrated
+            # User row — SELECT with LIMIT 1 skips ORM materialization.
+            row = db.execute(
+                text("SELECT phone, upi_id FROM users WHERE phone = :p LIMIT 1"),
+                {"p": "1234567890"},
+            ).one_or_none()
+            if row:
+                f.write(f"User EXISTS! Phone: {row.phone}, UPI: {row.upi_id}\n")
             else:
                 f.write("User does not exist with that phone number.\n")
         except Exception as e:
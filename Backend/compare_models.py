@@ -8,6 +8,15 @@ from sklearn.metrics import classification_report, precision_recall_fscore_suppo
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Prediction dominates this script's runtime; run it on the GPU when one
+# is present. CatBoost reports device availability itself, so no extra
+# framework is needed for the probe.
+try:
+    from catboost.utils import get_gpu_device_count
+    _TASK = "GPU" if get_gpu_device_count() > 0 else "CPU"
+except Exception:
+    _TASK = "CPU"
+
 # Paths
 PREVIOUS_MODEL = "app/ml/catboost_fraud_final.cbm"
 NEW_MODEL = "app/ml/fraud_model.cbm"
@@ -35,19 +44,24 @@ def compare_models():
     print(f"   - Feature Count: {p2}")
     print(f"   - File Size: {os.path.getsize(NEW_MODEL) / 1024:.2f} KB")
 
-    # Generate test data for both
+    # Generate one test matrix sized for the wider model; the narrower
+    # model evaluates a column-slice view of the same data. default_rng
+    # is faster than the legacy RandomState path and still reproducible.
     n_test = 1000
-    np.random.seed(99)
-    
-    def get_test_data(n, features_count):
-        X = np.random.rand(n, features_count)
-        # Create some patterns for labels
-        y = (X[:, 0] > 0.7).astype(int) 
-        return X, y
+    rng = np.random.default_rng(99)
+    X = rng.random((n_test, max(p1, p2))).astype(np.float32, order='F')
+    # Create some patterns for labels
+    y = (X[:, 0] > 0.7).astype(int)
+
+    def predict_labels(model, X_slice):
+        # Raw formula values skip the per-sample sigmoid; the sign gives
+        # the class label directly. thread_count=-1 uses all cores.
+        raw = model.predict(X_slice, prediction_type='RawFormulaVal',
+                            thread_count=-1, task_type=_TASK)
+        return (np.asarray(raw) > 0).astype(int)
 
-    X_new, y_new = get_test_data(n_test, p2)
-    y_pred_new = m_new.predict(X_new)
-    p_new, r_new, f_new, _ = precision_recall_fscore_support(y_new, y_pred_new, average='binary')
+    y_pred_new = predict_labels(m_new, X[:, :p2])
+    p_new, r_new, f_new, _ = precision_recall_fscore_support(y, y_pred_new, average='binary')
 
     print(f"\nNew Model (Context-Aware):")
     print(f"   - Precision: {p_new:.2f}")
@@ -55,9 +69,8 @@ def compare_models():
     print(f"   - F1-Score:  {f_new:.2f}")
 
     try:
-        X_prev, y_prev = get_test_data(n_test, p1)
-        y_pred_prev = m_prev.predict(X_prev)
-        p_prev, r_prev, f_prev, _ = precision_recall_fscore_support(y_prev, y_pred_prev, average='binary')
+        y_pred_prev = predict_labels(m_prev, X[:, :p1])
+        p_prev, r_prev, f_prev, _ = precision_recall_fscore_support(y, y_pred_prev, average='binary')
         print(f"\nPrevious Model (Basic):")
         print(f"   - Precision: {p_prev:.2f}")
         print(f"   - Recall:    {r_prev:.2f}")
@@ -1,4 +1,5 @@
 import asyncio
+from sqlalchemy import literal, select
 from app.database.connection import SessionLocal
 from app.database.models import User
 from app.services.auth_service import create_user, authenticate_user
@@ -11,20 +12,24 @@ def verify_db_user_directly(phone: str, upi_id: str):
     """Query the DB directly via SQLAlchemy to verify row insertion."""
     db = SessionLocal()
     try:
-        user = db.query(User).filter(User.phone == phone).first()
-        if not user:
+        # Only the columns under test — skips hydrating a full User entity
+        row = db.execute(
+            select(User.user_id, User.upi_id, User.password_hash)
+            .where(User.phone == phone)
+        ).one_or_none()
+        if not row:
             print(f"❌ [DB Check] User with phone {phone} NOT FOUND in database!")
             return False
-            
-        print(f"✅ [DB Check] User found! DB ID: {user.user_id}")
-        print(f"   ► Stored Phone: {user.phone}")
-        print(f"   ► Stored UPI: {user.upi_id}")
-        print(f"   ► Password Hash exists? {'Yes' if user.password_hash else 'No'}")
-        
-        if user.upi_id != upi_id:
-            print(f"❌ [DB Check] UPI ID Mismatch! Expected {upi_id}, got {user.upi_id}")
+
+        print(f"✅ [DB Check] User found! DB ID: {row.user_id}")
+        print(f"   ► Stored Phone: {phone}")
+        print(f"   ► Stored UPI: {row.upi_id}")
+        print(f"   ► Password Hash exists? {'Yes' if row.password_hash else 'No'}")
+
+        if row.upi_id != upi_id:
+            print(f"❌ [DB Check] UPI ID Mismatch! Expected {upi_id}, got {row.upi_id}")
             return False
-            
+
         return True
     finally:
         db.close()
@@ -52,8 +57,10 @@ async def interactive_test():
     print("\n[STEP 1] Creating User via AuthService...")
     db = SessionLocal()
     try:
-        # Check if user already exists
-        existing_user = db.query(User).filter(User.phone == test_phone).first()
+        # Check if user already exists — scalar EXISTS, no row hydration
+        existing_user = db.execute(
+            select(literal(1)).where(User.phone == test_phone).limit(1)
+        ).scalar() is not None
         if existing_user:
             print(f"User {test_phone} already exists, skipping creation.")
         else:
@@ -1,13 +1,23 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
 import psycopg2
 
-# Test connection to default 'postgres' database first
-try:
-    conn = psycopg2.connect(host='localhost', port=5432, user='postgres', password='sentra_secure_2026', dbname='postgres')
+COMMON_PASSWORDS = ['postgres', 'admin', 'password', '123456', 'surya', '1234', 'root', '']
+
+
+def try_connect(pw):
+    # connect_timeout bounds each attempt so an unreachable server fails
+    # in ~2s instead of hanging on the OS-level TCP timeout.
+    return pw, psycopg2.connect(host='localhost', port=5432, user='postgres',
+                                password=pw, dbname='postgres', connect_timeout=2)
+
+
+def ensure_database(conn):
     conn.autocommit = True
     cur = conn.cursor()
     cur.execute('SELECT datname FROM pg_database;')
     dbs = [r[0] for r in cur.fetchall()]
-    print('Connected OK! Databases:', dbs)
+    print('Databases:', dbs)
     if 'fraud_detection' not in dbs:
         print('Creating fraud_detection database...')
         cur.execute('CREATE DATABASE fraud_detection;')
@@ -16,30 +26,32 @@ try:
         print('fraud_detection database exists!')
     cur.close()
     conn.close()
+
+
+# Test connection to default 'postgres' database first
+try:
+    _, conn = try_connect('sentra_secure_2026')
+    print('Connected OK!')
+    ensure_database(conn)
 except Exception as e:
     print(f'Connection failed with sentra_secure_2026: {e}')
     print('Trying common passwords...')
-    found = False
-    for pw in ['postgres', 'admin', 'password', '123456', 'surya', '1234', 'root', '']:
-        try:
-            conn = psycopg2.connect(host='localhost', port=5432, user='postgres', password=pw, dbname='postgres')
-            print(f'SUCCESS with password: "{pw}"')
-            conn.autocommit = True
-            cur = conn.cursor()
-            cur.execute('SELECT datname FROM pg_database;')
-            dbs = [r[0] for r in cur.fetchall()]
-            print('Databases:', dbs)
-            if 'fraud_detection' not in dbs:
-                print('Creating fraud_detection database...')
-                cur.execute('CREATE DATABASE fraud_detection;')
-                print('Database created!')
+    # Fire every candidate at once: if the server is slow or unreachable the
+    # attempts time out in parallel (one timeout total, not one per password).
+    found = None
+    with ThreadPoolExecutor(max_workers=len(COMMON_PASSWORDS)) as pool:
+        futures = [pool.submit(try_connect, pw) for pw in COMMON_PASSWORDS]
+        for fut in as_completed(futures):
+            try:
+                pw, conn = fut.result()
+            except Exception as e2:
+                print(f'  Failed: {e2}')
+                continue
+            if found is None:
+                found = pw
+                print(f'SUCCESS with password: "{pw}"')
+                ensure_database(conn)
             else:
-                print('fraud_detection database exists!')
-            cur.close()
-            conn.close()
-            found = True
-            break
-        except Exception as e2:
-            print(f'  Failed with "{pw}": {e2}')
-    if not found:
+                conn.close()
+    if found is None:
         print('Could not connect with any common password. Please provide your PostgreSQL password.')
@@ -2,9 +2,10 @@
 Quick synchronous test - shows all test cases
 """
 import subprocess
-import time
 import sys
 
+from _test_utils import wait_for_ready
+
 print("="*70)
 print("  FRAUD DETECTION BACKEND - ALL TEST CASES")
 print("="*70)
@@ -12,14 +13,19 @@ print("="*70)
 # Start server
 print("\n1. Starting server...")
 server = subprocess.Popen(
-    [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", "8000"],
+    [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", "8000",
+     "--workers", "1", "--loop", "uvloop", "--http", "httptools"],
     stdout=subprocess.PIPE,
     stderr=subprocess.PIPE
 )
 
 # Wait for server
 print("2. Waiting for server to be ready...")
-time.sleep(3)
+if not wait_for_ready("http://127.0.0.1:8000/health"):
+    print("Server failed to start in time")
+    server.terminate()
+    server.wait()
+    sys.exit(1)
 
 # Run tests
 print("3. Running all test cases...\n")
@@ -4,9 +4,9 @@ This script starts the server in a subprocess and runs the tests.
 """
 
 import subprocess
-import time
 import sys
-import requests
+
+from _test_utils import wait_for_ready
 
 print("=" * 70)
 print("  STARTING FRAUD DETECTION BACKEND SERVER")
@@ -14,7 +14,8 @@ print("=" * 70)
 
 # Start the server in a subprocess
 server_process = subprocess.Popen(
-    [sys.executable, "-m", "uvicorn", "app.main:app", "--port", "8000"],
+    [sys.executable, "-m", "uvicorn", "app.main:app", "--port", "8000",
+     "--workers", "1", "--loop", "uvloop", "--http", "httptools"],
     stdout=subprocess.PIPE,
     stderr=subprocess.STDOUT,
     text=True,
@@ -23,16 +24,8 @@ server_process = subprocess.Popen(
 
 # Wait for server to start
 print("\nWaiting for server to start...")
-for i in range(30):  # Wait up to 30 seconds
-    try:
-        response = requests.get("http://localhost:8000/health", timeout=1)
-        if response.status_code == 200:
-            print("✓ Server is ready!\n")
-            break
-    except:
-        pass
-    time.sleep(1)
-    print(f"  Waiting... ({i+1}s)")
+if wait_for_ready("http://localhost:8000/health"):
+    print("✓ Server is ready!\n")
 else:
     print("\n✗ Server failed to start in time")
     server_process.terminate()